@@ -1,11 +1,16 @@
 from scipy import spatial
-import math
+import numpy as np
 
 
 class ComponentDescription():
     '''Describes a single component by its bounding box in the volume and a
     unique index.
 
+    The begin and shape of the bounding box are also stored as integer arrays
+    in `begin` and `shape`. The components it overlaps with are stored in
+    `overlapping_components`, together with the begin of each of their
+    bounding boxes relative to `begin` in `overlap_offsets`.
+
     Args:
 
         bounding_box (:class:`funlib.geometry.Roi`):
@@ -19,7 +24,10 @@ class ComponentDescription():
 
         self.bounding_box = bounding_box
         self.index = component_index
+        self.begin = np.asarray(bounding_box.begin, dtype=np.int32)
+        self.shape = np.asarray(bounding_box.shape, dtype=np.int32)
         self.overlapping_components = []
+        self.overlap_offsets = []
 
 
 def create_component_description(bounding_boxes):
@@ -39,66 +47,87 @@ def create_component_description(bounding_boxes):
     # create components from bounding boxes
     components = construct_components(bounding_boxes)
 
+    # get begins and ends of all bounding boxes as arrays of shape `(n, d)`
+    begins, ends = get_bounds(components)
+
     # get all components' centers
-    component_centers = [c.bounding_box.center for c in components]
+    component_centers = (begins + ends) / 2
 
     # create a KD-Tree
-    kd_tree = spatial.KDTree(component_centers)
-
-    # store overlapping components
-    overlaps = {
-        component.index:
-        find_overlapping_components(component, components, kd_tree)
-        for component in components
-    }
-
-    for index, overlapping_components in overlaps.items():
-        components[index].overlapping_components = overlapping_components
+    kd_tree = spatial.cKDTree(
+        component_centers,
+        balanced_tree=True,
+        compact_nodes=True)
+
+    # two boxes can only intersect if their centers are closer than half the
+    # sum of their extents along every axis, i.e., closer than the largest
+    # extent in the L-infinity norm
+    max_extent = np.max(ends - begins)
+
+    # query the close components of all components at once, using all cores
+    close_components = kd_tree.query_ball_point(
+        component_centers,
+        max_extent,
+        p=np.inf,
+        workers=-1)
+
+    # flatten into candidate pairs (i, j), each pair considered once
+    num_close = np.fromiter(map(len, close_components), dtype=int)
+    i = np.repeat(np.arange(len(components)), num_close)
+    j = np.concatenate(close_components).astype(int)
+    i, j = i[i < j], j[i < j]
+
+    # check which candidate pairs overlap
+    overlap = filter_overlaps(i, j, begins, ends)
+
+    # consider both directions of each overlapping pair, sorted by (i, j) such
+    # that overlapping components are stored in order of their index
+    i, j = i[overlap], j[overlap]
+    i, j = np.concatenate([i, j]), np.concatenate([j, i])
+    order = np.lexsort((j, i))
+    i, j = i[order], j[order]
+
+    # store overlapping components and their offsets
+    offsets = begins[j] - begins[i]
+    for index_i, index_j, offset in zip(i, j, offsets):
+        components[index_i].overlapping_components.append(
+            components[index_j])
+        components[index_i].overlap_offsets.append(offset)
 
     return components
 
 
-def find_overlapping_components(component, components, kd_tree):
-
-    component_center = component.bounding_box.center
+def construct_components(bounding_boxes):
 
-    # query all components that are close to 'component'
-    close_component_indices = kd_tree.query_ball_point(
-        component_center,
-        get_diagonal_length(component) + 1
-    )
-    close_components = [
-        components[i]
-        for i in close_component_indices
+    return [
+        ComponentDescription(bounding_box, box_index)
+        for box_index, bounding_box in enumerate(bounding_boxes)
     ]
 
-    # check if close components overlap with 'component'
-    overlapping_components = []
-    for close_component in close_components:
 
-        # skip the component itself
-        if close_component.index == component.index:
-            continue
+def get_bounds(components):
 
-        if close_component.bounding_box.intersects(component.bounding_box):
-            overlapping_components.append(close_component)
+    begins = np.stack([c.begin for c in components])
+    ends = begins + np.stack([c.shape for c in components])
 
-    return overlapping_components
+    return begins, ends
 
 
-def construct_components(bounding_boxes):
+def filter_overlaps(i, j, begins, ends):
+    '''Test which pairs of bounding boxes intersect.
 
-    return [
-        ComponentDescription(bounding_box, box_index)
-        for box_index, bounding_box in enumerate(bounding_boxes)
-    ]
+    Args:
 
+        i, j (array-like of int, shape `(m,)`):
+            Indices of the first and second bounding box of each pair.
 
-def get_diagonal_length(component):
+        begins, ends (array-like, shape `(n, d)`):
+            The begin and end of each bounding box.
 
-    begin = component.bounding_box.begin
-    end = component.bounding_box.end
+    Returns:
 
-    diagonal_length_squared = sum((end - begin)**2)
+        A boolean array of shape `(m,)`, which is `True` for each pair of
+        intersecting bounding boxes.
+    '''
 
-    return math.sqrt(diagonal_length_squared)
+    return np.all((begins[i] < ends[j]) & (begins[j] < ends[i]), axis=1)
@@ -4,6 +4,7 @@ from .optimize import dnmf
 from .parameters import Parameters
 from datetime import datetime
 import jax.numpy as jnp
+import numpy as np
 
 
 def fit(
@@ -36,7 +37,8 @@ def fit(
             The maximum number of iterations to optimize for.
 
         min_loss (float):
-            The loss value at which to stop the optimization.
+            The loss value at which to stop the optimization. The loss is the
+            sum of squared differences between data and reconstruction.
 
         batch_size (int):
             The number of frames to consider at once for each component during
@@ -82,11 +84,7 @@ def fit(
     B_groups = []
     log_groups = []
 
-    groups = get_groups(dataset)
-    component_group_index_pairings = \
-        {component.index: group_index
-            for group_index, group in enumerate(groups)
-            for component in group}
+    component_group_indices, groups = get_groups(dataset)
 
     for group in groups:
         H_group, W_group, B_group, log_group = fit_group(
@@ -98,7 +96,7 @@ def fit(
         B_groups.append(B_group)
         log_groups.append(log_group)
 
-    H, W, B = assemble(component_group_index_pairings,
+    H, W, B = assemble(component_group_indices,
                        H_groups, B_groups, W_groups)
 
     return H, W, B, log_groups
@@ -135,14 +133,13 @@ def fit_group(component_descriptions,
         :class: `Log`.
     """
 
-    component_size = None
-    for description in component_descriptions:
-        size = description.bounding_box.get_size()
-        if component_size is not None:
-            assert component_size == size, \
-                    "Only components of the same size are supported for now"
-        else:
-            component_size = size
+    component_shapes = np.stack([
+        description.shape
+        for description in component_descriptions
+    ])
+    assert np.all(component_shapes == component_shapes[0]), \
+        "Only components of the same size are supported for now"
+    component_size = int(np.prod(component_shapes[0]))
 
     sequence = dataset.sequence
     num_frames = sequence.shape[0]
@@ -165,7 +162,7 @@ def fit_group(component_descriptions,
     return H, W, B, log
 
 
-def assemble(component_group_index_pairings,
+def assemble(component_group_indices,
              H_groups,
              B_groups,
              W_groups):
@@ -173,9 +170,9 @@ def assemble(component_group_index_pairings,
 
     Args:
 
-        component_group_index_pairings (dictionary):
-            A dictionary of size number of the components that
-            map component index (key) to group index (value).
+        component_group_indices (array-like of int):
+            An array of size number of the components that stores the group
+            index of each component.
 
         H_groups (list):
             A list of `H_group` obtained from optimization result
@@ -193,15 +190,15 @@ def assemble(component_group_index_pairings,
          The optimization result of the dataset (i.e. H, W, B).
     """
 
-    num_components = len(component_group_index_pairings)
-    group_index = component_group_index_pairings[0]
+    num_components = len(component_group_indices)
+    group_index = component_group_indices[0]
 
     H = H_groups[group_index][0]
     B = B_groups[group_index][0]
     W = W_groups[group_index][0]
 
     for component_index in range(1, num_components):
-        group_index = component_group_index_pairings[component_index]
+        group_index = component_group_indices[component_index]
         H = jnp.vstack((H, H_groups[group_index][component_index]))
         B = jnp.vstack((B, B_groups[group_index][component_index]))
         W = jnp.vstack((W, W_groups[group_index][component_index]))
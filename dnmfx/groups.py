@@ -1,5 +1,7 @@
-import networkx as nx
 from .component_description import create_component_description
+from scipy.sparse import csgraph
+import numpy as np
+import scipy.sparse
 
 
 def get_groups(dataset):
@@ -17,25 +19,38 @@ def get_groups(dataset):
 
     Returns:
 
-        A list of lists of length the number of groups; each list contains a
-        number of :class:`ComponentDescription` that form a group.
+        A tuple `(labels, groups)`, where `labels` is an integer array of
+        shape `(n,)` that stores the group index of each component, and
+        `groups` is a list of lists of length the number of groups; each list
+        contains a number of :class:`ComponentDescription` that form a group.
     """
 
     component_descriptions = \
         create_component_description(dataset.bounding_boxes)
+    num_components = len(component_descriptions)
 
-    connection_dict = {
-                component_description:
-                component_description.overlapping_components
-                for component_description in component_descriptions}
+    # collect all edges between overlapping components as index pairs
+    edges = np.array([
+            (component_description.index, overlap.index)
+            for component_description in component_descriptions
+            for overlap in component_description.overlapping_components
+        ], dtype=np.int32).reshape(-1, 2)
 
-    # construct graph
-    G = nx.Graph()
-    G.add_nodes_from(connection_dict.keys())
+    # construct graph as sparse adjacency matrix over component indices
+    adjacency = scipy.sparse.csr_matrix(
+        (np.ones(len(edges)), (edges[:, 0], edges[:, 1])),
+        shape=(num_components, num_components))
 
-    for component_description, overlaps in connection_dict.items():
-        connections = list(zip([component_description]*len(overlaps),
-                               overlaps))
-        G.add_edges_from(connections)
+    _, labels = csgraph.connected_components(adjacency, directed=False)
 
-    return [list(c) for c in nx.connected_components(G)]
+    # sort component indices by group
+    indices = np.argsort(labels, kind='stable')
+    group_sizes = np.bincount(labels)
+    groups = np.split(indices, np.cumsum(group_sizes)[:-1])
+
+    groups = [
+        [component_descriptions[index] for index in group]
+        for group in groups
+    ]
+
+    return labels, groups
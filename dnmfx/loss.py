@@ -1,4 +1,4 @@
-from .utils import sigmoid
+from functools import partial
 import jax
 import jax.numpy as jnp
 
@@ -8,13 +8,17 @@ def l2_loss(
         W_logits,
         B_logits,
         x,
-        component_description,
+        overlap_table,
         frame_indices,
         l1_weight,
         components,
         traces):
-    """Compute the L2 distance between data from a single component and
-    reconstruction from optimization results.
+    """Compute the squared L2 distance between data from a single component
+    and reconstruction from optimization results.
+
+    The squared distance is used (instead of the distance itself) since it is
+    cheaper to evaluate and differentiate; the L1 regularizer is the sum of
+    absolute differences of components and traces to their ground-truth.
 
     Args:
 
@@ -27,12 +31,13 @@ def l2_loss(
         B_logits (array-like, shape `(k, w*h)`):
             Array of the background of the estimate components.
 
-        x (array-like, shape `(w, h)`):
-            Data from a single component.
+        x (array-like, shape `(b, w, h)`):
+            Data from a single component for each of the `b` frames in
+            `frame_indices`.
 
-        component_description (:class: `ComponentDescription`):
-            The bounding box, index, and overlapping components of the given
-            component `x`.
+        overlap_table (:class: `OverlapTable`):
+            The index and overlapping components of the given component `x`,
+            as a table with a single entry.
 
         frame_indices (list):
             A list of frame indices of length the batch size.
@@ -52,44 +57,117 @@ def l2_loss(
 
     Returns:
 
-        L2 distance between x and reconstruction `H_logits`, `W_logits`,
-        `B_logits`.
+        Squared L2 distance between x and reconstruction `H_logits`,
+        `W_logits`, `B_logits`.
     """
 
     assert len(H_logits.shape) == 2
     assert len(W_logits.shape) == 2
     assert len(B_logits.shape) == 2
 
+    shape = x.shape[1:]
+
     # get the current estimate for what x would look like (i.e., x_hat)
     x_hat = get_x_hat(
             H_logits,
             W_logits,
             B_logits,
-            component_description,
-            frame_indices)
+            overlap_table,
+            frame_indices,
+            shape)
 
-    l2_loss = jnp.linalg.norm(x - x_hat)
+    l2_loss = jnp.sum(jnp.square(x - x_hat))
 
     if components is not None and traces is not None:
 
-        i = component_description.index
-        bb_i = component_description.bounding_box
-        l1_loss = jnp.linalg.norm(
+        i = overlap_table.component_indices
+        l1_loss = jnp.sum(jnp.abs(
                     components[i] -
-                    sigmoid(H_logits[i]).reshape(bb_i.shape), ord=1) + \
-            jnp.linalg.norm(
+                    jax.nn.sigmoid(H_logits[i]).reshape(shape))) + \
+            jnp.sum(jnp.abs(
                 traces[i, frame_indices] -
-                sigmoid(W_logits[i, frame_indices]), ord=1)
+                jax.nn.sigmoid(W_logits[i, frame_indices])))
     else:
         l1_loss = 0
 
     return l2_loss + l1_weight * l1_loss
 
 
-l2_loss_grad = jax.value_and_grad(l2_loss, argnums=(0, 1, 2))
+def l2_loss_group(
+        H_logits,
+        W_logits,
+        B_logits,
+        x,
+        overlap_table,
+        frame_indices,
+        l1_weight,
+        components,
+        traces):
+    """Compute the mean of :func:`l2_loss` over all components of a group at
+    once.
+
+    Args:
+
+        H_logits (array-like, shape `(k, w*h)`):
+             Array of the estimated components.
+
+        W_logits (array-like, shape `(k, t)`):
+            Array of the activities of the estimated components.
+
+        B_logits (array-like, shape `(k, w*h)`):
+            Array of the background of the estimate components.
+
+        x (array-like, shape `(n, b, w, h)`):
+            Data from each of the `n` components of the group for each of the
+            `b` frames in `frame_indices`.
+
+        overlap_table (:class: `OverlapTable`):
+            The indices and overlapping components of the `n` components of
+            the group.
+
+        frame_indices (list):
+            A list of frame indices of length the batch size.
+
+        l1_weight (float):
+            Parameter for regularizing; how much penalty to give for component
+            and trace loss.
+
+        components (:class: `jax.numpy.array`):
+            Stores the value of components in an array-like data structure of
+            shape `(k, y, x)`, where `k` is the total number of components.
+
+        traces (:class: `jax.numpy.array`):
+            Stores the activity trace of each component across all time frames
+            available in an array-like data structure of shape `(k, t)`, where
+            t is the number of time frames, `k` the number of components.
+
+    Returns:
+
+        The mean of the losses of all components in the group.
+    """
+
+    losses = jax.vmap(
+        l2_loss,
+        in_axes=(None, None, None, 0, 0, None, None, None, None))(
+            H_logits,
+            W_logits,
+            B_logits,
+            x,
+            overlap_table,
+            frame_indices,
+            l1_weight,
+            components,
+            traces)
+
+    return jnp.mean(losses)
+
+
+l2_loss_group_grad = jax.jit(
+    jax.value_and_grad(l2_loss_group, argnums=(0, 1, 2)))
 
 
-def get_x_hat(H_logits, W_logits, B_logits, component_description, frames):
+@partial(jax.jit, static_argnames='shape')
+def get_x_hat(H_logits, W_logits, B_logits, overlap_table, frames, shape):
     """Estimate reconstruction of a single component from array of estimated
     components, traces, and backgrounds; suppose the component to be estimated
     is c and denote every of its overlapping component as c', we reconstruct
@@ -102,53 +180,122 @@ def get_x_hat(H_logits, W_logits, B_logits, component_description, frames):
         H_logits (array-like, shape `(k, w*h)`):
             Array of the estimated components.
 
-        W_logits (array-like, shape `(t, k)`):
+        W_logits (array-like, shape `(k, t)`):
             Array of the activities of the estimated components.
 
         B_logits (array-like, shape `(k, w*h)`):
             Array of the background of the estimate components.
 
-        component_description (:class: `ComponentDescription`):
-            The bounding box, index, and overlapping components of some
-            component `x`.
+        overlap_table (:class: `OverlapTable`):
+            The index and overlapping components of some component `x`, as a
+            table with a single entry.
 
         frames (list):
             A list of frame indices of length the batch size.
 
+        shape (tuple of int):
+            The shape of the bounding box of each component.
+
     Returns:
 
         Reconstructed x̂_c.
     """
 
-    i = component_description.index
-    bb_i = component_description.bounding_box
-    w = sigmoid(W_logits[i, frames])
-    h = sigmoid(H_logits[i])
-    b = sigmoid(B_logits[i])
+    i = overlap_table.component_indices
+    num_full = 1 + overlap_table.identical_indices.shape[0]
+
+    # gather and squash the factors of the component and all of its
+    # (padded) overlapping components at once
+    indices = jnp.concatenate([
+        i[None],
+        overlap_table.identical_indices,
+        overlap_table.overlap_indices])
+    H = jax.nn.sigmoid(H_logits[indices].reshape(-1, *shape))
+    B = jax.nn.sigmoid(B_logits[indices].reshape(-1, *shape))
+    W = jax.nn.sigmoid(W_logits[indices][:, frames])
+
+    # the component itself and identical overlaps cover the whole bounding
+    # box and can be added directly
+    full_mask = jnp.concatenate([
+        jnp.ones((1,), dtype=bool),
+        overlap_table.identical_mask])
+    x_hat = reconstruct(W[:num_full], H[:num_full], B[:num_full], full_mask)
+
+    # move all other overlapping components into the frame of the component
+    # (only traced if there are any in the table)
+    if overlap_table.overlap_indices.shape[0] > 0:
+
+        # shift component and background of each overlap together
+        tiles = jax.vmap(
+            shift_overlap,
+            in_axes=(0, 0, None))(
+                jnp.stack([H[num_full:], B[num_full:]], axis=1),
+                overlap_table.overlap_offsets,
+                shape)
+
+        x_hat += reconstruct(
+            W[num_full:],
+            tiles[:, 0],
+            tiles[:, 1],
+            overlap_table.overlap_mask)
+
+    return x_hat
+
+
+def reconstruct(W, H, B, mask):
+    """Sum the reconstructions of a number of components.
+
+    Args:
+
+        W (array-like, shape `(o, t)`):
+            The activities of the components.
+
+        H, B (array-like, shape `(o, w, h)`):
+            The components and their backgrounds.
+
+        mask (array-like of bool, shape `(o,)`):
+            Which of the components to include; all others contribute
+            nothing.
+
+    Returns:
+
+        The sum of the reconstructions of all included components.
+    """
+
+    W = jnp.where(mask[:, None], W, 0.0)
+    B = jnp.where(mask.reshape(-1, *(1,) * (B.ndim - 1)), B, 0.0)
 
-    x_hat = jnp.outer(w, h).reshape(-1, *h.shape) + b
-    x_hat = x_hat.reshape(-1, *bb_i.shape)
+    return jnp.einsum('ot,o...->t...', W, H) + jnp.sum(B, axis=0)
 
-    for overlap in component_description.overlapping_components:
 
-        j = overlap.index
-        bb_j = overlap.bounding_box
+def shift_overlap(tile, offset, shape):
+    """Move an overlapping component into the bounding box of another
+    component.
 
-        intersection = bb_i.intersect(bb_j)
-        intersection_in_c_i = intersection - bb_i.get_begin()
-        intersection_in_c_j = intersection - bb_j.get_begin()
+    Args:
 
-        slices_i = (slice(None),) + intersection_in_c_i.to_slices()
-        slices_j = (j,) + intersection_in_c_j.to_slices()
+        tile (array-like, shape `(c, w, h)`):
+            A number of `c` arrays of the overlapping component to move at
+            once, e.g., the component and its background.
 
-        H_logits = H_logits.reshape(-1, *bb_i.shape)
-        B_logits = B_logits.reshape(-1, *bb_i.shape)
+        offset (array-like of int, shape `(d,)`):
+            The begin of the overlapping component relative to the begin of
+            the component.
 
-        w = sigmoid(W_logits[j, frames])
-        h = sigmoid(H_logits[slices_j])
-        b = sigmoid(B_logits[slices_j])
+        shape (tuple of int):
+            The shape of the bounding box of each component.
 
-        x_hat = \
-            x_hat.at[slices_i].add(jnp.outer(w, h).reshape(-1, *h.shape) + b)
+    Returns:
 
-    return x_hat
+        The arrays of the overlapping component in the bounding box of the
+        component, zero outside of the intersection of both bounding boxes.
+    """
+
+    # pad with zeros on all spatial sides and cut out the part that falls
+    # into the component's bounding box
+    padding = [(0, 0)] + [(s, s) for s in shape]
+    begin = jnp.concatenate([
+        jnp.zeros((1,), dtype=offset.dtype),
+        jnp.array(shape, dtype=offset.dtype) - offset])
+
+    return jax.lax.dynamic_slice(jnp.pad(tile, padding), begin, tile.shape)
@@ -1,9 +1,11 @@
 from .log import Log
-from .loss import l2_loss_grad
+from .loss import l2_loss_group_grad
+from .overlap_table import create_overlap_table
 from .utils import sigmoid
 from tqdm import tqdm
 import jax
 import jax.numpy as jnp
+import numpy as np
 import random
 
 
@@ -49,8 +51,6 @@ def dnmf(
     """
 
     log = Log()
-    l2_loss_grad_jit = jax.jit(l2_loss_grad,
-                               static_argnums=(4,))
     update_jit = jax.jit(update)
     aggregate_loss = 0
 
@@ -58,12 +58,17 @@ def dnmf(
     components = jnp.array(dataset.components)
     traces = jnp.array(dataset.traces)
 
+    # describe the overlaps of each component as arrays of the same shape,
+    # such that the loss can be evaluated for all components at once
+    overlap_table = create_overlap_table(component_descriptions)
+    slices = [
+        get_slices(component_description)
+        for component_description in component_descriptions
+    ]
+
     for iteration in tqdm(range(parameters.max_iteration)):
 
-        # pick a random component
         random.seed(parameters.random_seed + iteration)
-        component_description = random.sample(component_descriptions, 1)[0]
-        component_bounding_box = component_description.bounding_box
 
         num_frames = sequence.shape[0]
         # pick a random subset of frames
@@ -71,17 +76,17 @@ def dnmf(
             list(range(num_frames)),
             parameters.batch_size))
 
-        # gather the sequence data for those components/frames
-        x = get_x(sequence, frame_indices, component_bounding_box)
+        # gather the sequence data for all components and those frames
+        x = get_x(sequence, frame_indices, slices)
 
-        # compute the current loss and gradient
+        # compute the current loss and gradient of all components
         loss, (grad_H_logits, grad_W_logits, grad_B_logits) = \
-            l2_loss_grad_jit(
+            l2_loss_group_grad(
                 H_logits,
                 W_logits,
                 B_logits,
                 x,
-                component_description,
+                overlap_table,
                 frame_indices,
                 parameters.l1_weight,
                 components,
@@ -132,8 +137,8 @@ def dnmf(
     return sigmoid(H_logits), sigmoid(W_logits), sigmoid(B_logits), log
 
 
-def get_x(sequence, frames, bounding_box):
-    """Extract the region defined by the bounding box from the given sequence.
+def get_x(sequence, frames, slices):
+    """Extract the regions defined by slices from the given sequence.
 
     Args:
         sequence (array-like, shape `(t, [z,] y, x)`):
@@ -144,19 +149,42 @@ def get_x(sequence, frames, bounding_box):
         frames (list):
             A list of frame indices of length the batch size.
 
-        bounding_box (:class: `funlib.geometry.Roi`):
-            Bounding box of :class: `funlib.geometry.Roi` that defines a
-            rectangular region.
+        slices (list of tuple of slice):
+            Slices that define rectangular regions of the same shape, e.g.,
+            as returned by :func:`get_slices`.
 
     Returns:
-         A region defined by the bounding box from the given sequence.
+         The regions defined by the slices from the given sequence, as an
+         array of shape `(n, b, [z,] y, x)` for `n` regions and `b` frames.
     """
 
-    slices = bounding_box.to_slices()
-    x = jnp.array([sequence[(t,) + slices] for t in frames])
-    x = x.reshape(-1, *bounding_box.shape)
+    x = np.stack([
+        np.stack([
+            sequence[(t,) + region]
+            for t in frames
+        ])
+        for region in slices
+    ])
+
+    return jnp.array(x)
+
+
+def get_slices(component_description):
+    """Get the slices of the bounding box of a component.
+
+    Args:
+        component_description (:class: `ComponentDescription`):
+            The component to get the slices for.
+
+    Returns:
+        A tuple of slices, one for each spatial dimension.
+    """
 
-    return x
+    return tuple(
+        slice(b, b + s)
+        for b, s in zip(
+            component_description.begin.tolist(),
+            component_description.shape.tolist()))
 
 
 def update(H_logits, W_logits, B_logits, grad_H, grad_W, grad_B, step_size):
@@ -0,0 +1,162 @@
+from jax.tree_util import register_pytree_node_class
+import jax.numpy as jnp
+import numpy as np
+
+
+@register_pytree_node_class
+class OverlapTable():
+    '''Describes the overlaps of a number of components as arrays of fixed
+    size, such that jitted functions can be traced once for all of them.
+
+    Overlapping components with the same bounding box as the component
+    (identical overlaps) are stored separately from all other overlaps, since
+    they don't need to be moved into the component's bounding box. Each
+    component's identical and other overlaps are padded to the largest number
+    of such overlaps in the table; padded entries are marked in
+    `identical_mask` and `overlap_mask`, respectively.
+
+    Indexing an :class:`OverlapTable` indexes the leading axis of all arrays,
+    e.g., `overlap_table[k]` is the table of the `k`-th component only.
+
+    Args:
+
+        component_indices (array-like of int, shape `(n,)`):
+            The index of each component.
+
+        identical_indices (array-like of int, shape `(n, l)`):
+            The indices of the components with the same bounding box as each
+            component.
+
+        identical_mask (array-like of bool, shape `(n, l)`):
+            Whether an entry in `identical_indices` is an actual overlap or
+            padding.
+
+        overlap_indices (array-like of int, shape `(n, m)`):
+            The indices of all other components each component overlaps with.
+
+        overlap_offsets (array-like of int, shape `(n, m, d)`):
+            The begin of each overlapping component's bounding box relative
+            to the begin of the component's bounding box.
+
+        overlap_mask (array-like of bool, shape `(n, m)`):
+            Whether an entry in `overlap_indices` is an actual overlap or
+            padding.
+    '''
+
+    def __init__(
+            self,
+            component_indices,
+            identical_indices,
+            identical_mask,
+            overlap_indices,
+            overlap_offsets,
+            overlap_mask):
+
+        self.component_indices = component_indices
+        self.identical_indices = identical_indices
+        self.identical_mask = identical_mask
+        self.overlap_indices = overlap_indices
+        self.overlap_offsets = overlap_offsets
+        self.overlap_mask = overlap_mask
+
+    def __getitem__(self, key):
+
+        return OverlapTable(*(a[key] for a in self.tree_flatten()[0]))
+
+    def __len__(self):
+
+        return len(self.component_indices)
+
+    def tree_flatten(self):
+        children = (self.component_indices,
+                    self.identical_indices,
+                    self.identical_mask,
+                    self.overlap_indices,
+                    self.overlap_offsets,
+                    self.overlap_mask)
+        aux_data = None
+        return (children, aux_data)
+
+    @classmethod
+    def tree_unflatten(cls, aux_data, children):
+        return cls(*children)
+
+
+def create_overlap_table(component_descriptions):
+    '''Create an :class:`OverlapTable` from a list of ComponentDescription.
+
+    All components are assumed to have bounding boxes of the same shape.
+
+    Args:
+
+        component_descriptions (list of :class:`ComponentDescription`):
+            The components to describe, e.g., all components of a group.
+
+    Returns:
+
+        An :class:`OverlapTable` with one entry per component, in the order
+        of `component_descriptions`.
+    '''
+
+    num_components = len(component_descriptions)
+    num_dims = len(component_descriptions[0].shape)
+
+    # split overlaps into identical and other overlaps
+    identical = []
+    overlaps = []
+    for component in component_descriptions:
+
+        is_identical = [
+            not np.any(offset)
+            for offset in component.overlap_offsets
+        ]
+        identical.append([
+            overlap.index
+            for overlap, i in zip(
+                component.overlapping_components,
+                is_identical)
+            if i
+        ])
+        overlaps.append([
+            (overlap.index, offset)
+            for overlap, offset, i in zip(
+                component.overlapping_components,
+                component.overlap_offsets,
+                is_identical)
+            if not i
+        ])
+
+    max_identical = max(len(i) for i in identical)
+    max_overlaps = max(len(o) for o in overlaps)
+
+    component_indices = np.zeros((num_components,), dtype=np.int32)
+    identical_indices = np.zeros(
+        (num_components, max_identical),
+        dtype=np.int32)
+    identical_mask = np.zeros((num_components, max_identical), dtype=bool)
+    overlap_indices = np.zeros((num_components, max_overlaps), dtype=np.int32)
+    overlap_offsets = np.zeros(
+        (num_components, max_overlaps, num_dims),
+        dtype=np.int32)
+    overlap_mask = np.zeros((num_components, max_overlaps), dtype=bool)
+
+    for k, component in enumerate(component_descriptions):
+
+        component_indices[k] = component.index
+
+        for m, index in enumerate(identical[k]):
+            identical_indices[k, m] = index
+            identical_mask[k, m] = True
+
+        for m, (index, offset) in enumerate(overlaps[k]):
+            overlap_indices[k, m] = index
+            overlap_offsets[k, m] = offset
+            overlap_mask[k, m] = True
+
+    return OverlapTable(
+        jnp.array(component_indices),
+        jnp.array(identical_indices),
+        jnp.array(identical_mask),
+        jnp.array(overlap_indices),
+        jnp.array(overlap_offsets),
+        jnp.array(overlap_mask))
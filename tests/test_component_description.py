@@ -0,0 +1,92 @@
+from dnmfx.component_description import create_component_description
+import funlib.geometry as fg
+import numpy as np
+import unittest
+
+
+class TestComponentDescription(unittest.TestCase):
+
+    def test_overlaps_2d(self):
+        """
+        Checking overlap detection against all pairs of boxes in 2D.
+        """
+
+        bounding_boxes = self._generate_bounding_boxes(
+                            num_boxes=200,
+                            image_size=256,
+                            min_size=2,
+                            max_size=40,
+                            dims=2)
+        self._check_overlaps(bounding_boxes)
+
+    def test_overlaps_3d(self):
+        """
+        Checking overlap detection against all pairs of boxes in 3D.
+        """
+
+        bounding_boxes = self._generate_bounding_boxes(
+                            num_boxes=100,
+                            image_size=64,
+                            min_size=1,
+                            max_size=20,
+                            dims=3)
+        self._check_overlaps(bounding_boxes)
+
+    def test_identical_and_touching(self):
+        """
+        Checking that identical boxes overlap and touching boxes do not.
+        """
+
+        bounding_boxes = [fg.Roi((0, 0), (4, 4)),
+                          fg.Roi((0, 0), (4, 4)),
+                          fg.Roi((4, 0), (4, 4)),
+                          fg.Roi((3, 3), (1, 1))]
+        self._check_overlaps(bounding_boxes)
+
+    def _check_overlaps(self, bounding_boxes):
+
+        components = create_component_description(bounding_boxes)
+
+        for component in components:
+
+            expected = [
+                j for j, bounding_box in enumerate(bounding_boxes)
+                if j != component.index and
+                bounding_box.intersects(component.bounding_box)
+            ]
+            found = [c.index for c in component.overlapping_components]
+
+            assert found == expected, \
+                f"Overlaps of component {component.index} match expectation"
+
+            for overlap, offset in zip(
+                    component.overlapping_components,
+                    component.overlap_offsets):
+                assert tuple(offset) == tuple(
+                        overlap.bounding_box.begin -
+                        component.bounding_box.begin), \
+                    f"Offsets of component {component.index} match " \
+                    "expectation"
+
+    def _generate_bounding_boxes(self,
+                                 num_boxes,
+                                 image_size,
+                                 min_size,
+                                 max_size,
+                                 dims):
+
+        random_state = np.random.RandomState(42)
+
+        shapes = random_state.randint(
+                    min_size,
+                    max_size,
+                    size=(num_boxes, dims))
+        begins = random_state.randint(
+                    0,
+                    image_size - max_size,
+                    size=(num_boxes, dims))
+
+        return [
+            fg.Roi(tuple(begin), tuple(shape))
+            for begin, shape in zip(begins, shapes)
+        ]
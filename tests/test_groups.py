@@ -0,0 +1,33 @@
+from dnmfx import Dataset
+from dnmfx.groups import get_groups
+import funlib.geometry as fg
+import numpy as np
+import unittest
+
+
+class TestGroups(unittest.TestCase):
+
+    def test_groups(self):
+        """
+        Checking that groups are the connected components of overlapping
+        bounding boxes.
+        """
+
+        bounding_boxes = [fg.Roi((0, 0), (4, 4)),
+                          fg.Roi((10, 10), (4, 4)),
+                          fg.Roi((2, 2), (4, 4)),
+                          fg.Roi((20, 20), (4, 4)),
+                          fg.Roi((5, 5), (4, 4)),
+                          fg.Roi((12, 12), (4, 4))]
+        dataset = Dataset(
+                    bounding_boxes,
+                    traces=np.zeros((len(bounding_boxes), 1)),
+                    background=np.zeros((32, 32)))
+
+        labels, groups = get_groups(dataset)
+        groups = [[c.index for c in group] for group in groups]
+
+        assert groups == [[0, 2, 4], [1, 5], [3]], \
+            "Groups match expectation"
+        assert list(labels) == [0, 1, 0, 2, 0, 1], \
+            "Group indices match expectation"
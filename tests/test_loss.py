@@ -0,0 +1,73 @@
+from dnmfx.component_description import create_component_description
+from dnmfx.loss import get_x_hat
+from dnmfx.overlap_table import create_overlap_table
+import funlib.geometry as fg
+import jax.numpy as jnp
+import numpy as np
+import unittest
+
+
+class TestLoss(unittest.TestCase):
+
+    def test_x_hat_2d(self):
+        """
+        Checking reconstruction of overlapping components in 2D.
+        """
+
+        self._check_x_hat(shape=(6, 5), image_size=20, num_components=25)
+
+    def test_x_hat_3d(self):
+        """
+        Checking reconstruction of overlapping components in 3D.
+        """
+
+        self._check_x_hat(shape=(3, 4, 5), image_size=10, num_components=20)
+
+    def _check_x_hat(self, shape, image_size, num_components):
+
+        random_state = np.random.RandomState(42)
+        num_frames = 7
+        frames = (1, 4, 5)
+
+        bounding_boxes = [
+            fg.Roi(
+                tuple(random_state.randint(0, image_size, size=len(shape))),
+                shape)
+            for _ in range(num_components)
+        ]
+        # include a pair of identical bounding boxes
+        bounding_boxes.append(bounding_boxes[0])
+
+        component_descriptions = create_component_description(bounding_boxes)
+        overlap_table = create_overlap_table(component_descriptions)
+
+        size = int(np.prod(shape))
+        k = len(bounding_boxes)
+        H_logits = random_state.normal(size=(k, size)).astype(np.float32)
+        W_logits = random_state.normal(size=(k, num_frames)).astype(np.float32)
+        B_logits = random_state.normal(size=(k, size)).astype(np.float32)
+        H, W, B = (
+            1 / (1 + np.exp(-logits))
+            for logits in (H_logits, W_logits, B_logits))
+
+        # render all components into one sequence
+        frame_shape = (image_size + max(shape),) * len(shape)
+        sequence = np.zeros((len(frames),) + frame_shape, dtype=np.float32)
+        for bounding_box, h, w, b in zip(bounding_boxes, H, W, B):
+            sequence[(slice(None),) + bounding_box.to_slices()] += \
+                np.outer(w[list(frames)], h).reshape(-1, *shape) + \
+                b.reshape(shape)
+
+        for k, component in enumerate(component_descriptions):
+
+            x_hat = get_x_hat(
+                jnp.array(H_logits),
+                jnp.array(W_logits),
+                jnp.array(B_logits),
+                overlap_table[k],
+                frames,
+                shape)
+            x = sequence[(slice(None),) + component.bounding_box.to_slices()]
+
+            assert np.allclose(x_hat, x, atol=1e-5), \
+                f"Reconstruction of component {k} matches expectation"
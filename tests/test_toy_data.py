@@ -35,15 +35,22 @@ class TestCaseA(unittest.TestCase):
         h_logits = iter_log.H_logits[0][0]
         b_logits = iter_log.B_logits[0][0]
 
-        expected_grad_H_logits = \
+        # derivative of the squared loss wrt. the reconstruction
+        x = toy_data.sequence[0, 0, 0]
+        x_hat = 1/(1 + math.e**(-w_logits)) * 1/(1 + math.e**(-h_logits)) + \
+                1/(1 + math.e**(-b_logits))
+        grad_x_hat = 2 * (x_hat - x)
+
+        expected_grad_H_logits = grad_x_hat * \
                 1/(1 + math.e**(-w_logits)) * \
                 math.e**(-h_logits)/(1 + math.e**(-h_logits))**2
 
-        expected_grad_W_logits = \
+        expected_grad_W_logits = grad_x_hat * \
                 1/(1 + math.e**(-h_logits)) * \
                 math.e**(-w_logits)/(1 + math.e**(-w_logits))**2
 
-        expected_grad_B_logits = math.e**(-b_logits)/(1 + math.e**(-b_logits))**2
+        expected_grad_B_logits = grad_x_hat * \
+                math.e**(-b_logits)/(1 + math.e**(-b_logits))**2
 
         assert abs(iter_log.grad_H_logits - expected_grad_H_logits) < 1e-3, \
                 "Partial gradient H wrt. loss matches expectation"